@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
-from typing import Dict, List, Mapping, Optional
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Type
 
 from dotenv import load_dotenv
 
@@ -87,7 +88,7 @@ class ConfigSanitizer:
         return f"{token[:3]}...{token[-3:]}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class KeepAliveConfig:
     target_urls: List[str]
     post_load_urls: List[str]
@@ -118,14 +119,18 @@ class KeepAliveConfig:
 
 class ConfigLoader:
     def __init__(self, environ: Mapping[str, str]):
-        self._parser = EnvValueParser(environ)
+        self._environ_snapshot = dict(environ)
+        self._parser = EnvValueParser(self._environ_snapshot)
 
     @classmethod
     def from_env(cls, load_dotenv_enabled: bool = True) -> KeepAliveConfig:
-        if load_dotenv_enabled:
-            load_dotenv()
-        loader = cls(os.environ)
-        return loader.load()
+        config = _from_env_cached(cls, load_dotenv_enabled)
+        # The cached instance is shared; hand out private copies of its lists.
+        return replace(
+            config,
+            target_urls=list(config.target_urls),
+            post_load_urls=list(config.post_load_urls),
+        )
 
     def load(self) -> KeepAliveConfig:
         return KeepAliveConfig(
@@ -158,3 +163,12 @@ class ConfigLoader:
             telegram_bot_token=self._parser.get_optional_str("TELEGRAM_BOT_TOKEN"),
             telegram_chat_id=self._parser.get_optional_str("TELEGRAM_CHAT_ID"),
         )
+
+
+@lru_cache(maxsize=None)
+def _from_env_cached(
+    loader_cls: Type[ConfigLoader], load_dotenv_enabled: bool
+) -> KeepAliveConfig:
+    if load_dotenv_enabled:
+        load_dotenv()
+    return loader_cls(os.environ).load()
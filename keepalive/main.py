@@ -2,66 +2,117 @@ from __future__ import annotations
 
 import argparse
 import json
+import math
 import sys
+import threading
 import time
+from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Dict, List
-from urllib.parse import urlparse
+from functools import lru_cache
+from typing import (
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 from keepalive.config import ConfigLoader, KeepAliveConfig
-from keepalive.pinger import PingResult, PingerManager, RetryPolicy, UserAgentProvider
+from keepalive.pinger import PingResult, PingerManager, RetryPolicy
 from keepalive.telegram import TelegramAlertManager
 
+_PARSER = argparse.ArgumentParser(description="ParlayGorilla Keep-Alive Pinger")
+_PARSER.add_argument(
+    "--once",
+    action="store_true",
+    help="Run one ping cycle then exit.",
+)
+_PARSER.add_argument(
+    "--print-config",
+    action="store_true",
+    help="Print resolved config and exit.",
+)
+_PARSER.add_argument(
+    "--no-dotenv",
+    action="store_true",
+    help="Skip loading .env and read config from the environment only.",
+)
 
-class TimeProvider:
-    def utc_now_iso(self) -> str:
-        return datetime.now(timezone.utc).isoformat()
 
-    def now_epoch_seconds(self) -> float:
-        return time.time()
+def utc_now_iso() -> str:
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+    return f"{stamp}.{nanos // 1000:06d}+00:00"
+
+
+def now_epoch_seconds() -> float:
+    return time.time()
 
 
 class ResultLogManager:
-    def __init__(self, time_provider: TimeProvider):
-        self._time_provider = time_provider
+    def __init__(self, time_now_iso: Callable[[], str] = utc_now_iso):
+        self._time_now_iso = time_now_iso
+        self._encode = json.JSONEncoder(separators=(",", ":")).encode
+        self._buffer: List[str] = []
+        # log_result is called from ping worker threads.
+        self._lock = threading.Lock()
 
     def log_result(self, url: str, result: PingResult) -> None:
         payload = {
-            "ts": self._time_provider.utc_now_iso(),
+            "ts": self._time_now_iso(),
             "url": url,
             "ok": result.ok,
             "status": result.status,
             "latency_ms": result.latency_ms,
             "error": result.error,
         }
-        print(json.dumps(payload), flush=True)
+        line = self._encode(payload) + "\n"
+        with self._lock:
+            self._buffer.append(line)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._buffer:
+                sys.stdout.write("".join(self._buffer))
+                self._buffer.clear()
+            sys.stdout.flush()
 
 
 class UrlSequenceBuilder:
     def __init__(self, target_urls: List[str], post_load_urls: List[str]):
-        self._target_urls = list(target_urls)
-        self._post_load_urls = list(post_load_urls)
+        if target_urls:
+            primary_url = target_urls[0]
+            remaining_urls = list(target_urls[1:])
+            self._sequence = tuple(
+                [primary_url] + list(post_load_urls) + remaining_urls
+            )
+        else:
+            self._sequence = tuple(post_load_urls)
 
-    def build(self) -> List[str]:
-        if not self._target_urls:
-            return list(self._post_load_urls)
-        primary_url = self._target_urls[0]
-        remaining_urls = self._target_urls[1:]
-        return [primary_url] + list(self._post_load_urls) + remaining_urls
+    def build(self) -> Tuple[str, ...]:
+        return self._sequence
 
 
 class HealthEndpointClassifier:
     def __init__(self, health_paths: List[str] | None = None):
-        self._health_paths = health_paths or ["/health", "/api/health"]
+        paths = health_paths or ["/health", "/api/health"]
+        self._suffixes = tuple(
+            path.rstrip("/") for path in paths if path.rstrip("/")
+        )
 
     def is_health_endpoint(self, url: str) -> bool:
-        path = urlparse(url).path.rstrip("/")
-        normalized = path if path else "/"
-        return normalized in self._health_paths
+        # Match against the URL up to any query or fragment; no full parse.
+        end = len(url)
+        for separator in ("?", "#"):
+            index = url.find(separator, 0, end)
+            if index != -1:
+                end = index
+        return url[:end].rstrip("/").endswith(self._suffixes)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PingOutcome:
     is_failure: bool
     is_warning_only: bool
@@ -81,28 +132,29 @@ class PingOutcomeEvaluator:
 
 class FailureTracker:
     def __init__(self):
-        self._counts: Dict[str, int] = {}
+        self._counts: DefaultDict[str, int] = defaultdict(int)
 
     def record(self, url: str, is_failure: bool) -> int:
         if is_failure:
-            self._counts[url] = self._counts.get(url, 0) + 1
-        else:
-            self._counts[url] = 0
-        return self._counts[url]
+            self._counts[url] += 1
+            return self._counts[url]
+        self._counts[url] = 0
+        return 0
 
 
 class LatencyAlertLimiter:
     def __init__(self, cooldown_seconds: int):
         self._cooldown_seconds = max(1, cooldown_seconds)
-        self._last_alert_by_url: Dict[str, float] = {}
+        # Earliest epoch second at which each URL may alert again.
+        self._deadlines: Dict[str, float] = {}
+
+    def register_urls(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self._deadlines.setdefault(url, -math.inf)
 
     def should_alert(self, url: str, now_epoch_seconds: float) -> bool:
-        last_alert = self._last_alert_by_url.get(url)
-        if last_alert is None:
-            self._last_alert_by_url[url] = now_epoch_seconds
-            return True
-        if now_epoch_seconds - last_alert >= self._cooldown_seconds:
-            self._last_alert_by_url[url] = now_epoch_seconds
+        if now_epoch_seconds >= self._deadlines.get(url, -math.inf):
+            self._deadlines[url] = now_epoch_seconds + self._cooldown_seconds
             return True
         return False
 
@@ -133,23 +185,25 @@ class AlertPolicyManager:
         return self._latency_limiter.should_alert(url, now_epoch_seconds)
 
 
-class AlertMessageBuilder:
-    def build_failure_message(
-        self, url: str, failure_count: int, result: PingResult
-    ) -> str:
-        status_text = f"status={result.status}" if result.status is not None else "status=none"
-        error_text = f" error={result.error}" if result.error else ""
-        return (
-            f"Keepalive alert: {url} failed {failure_count} times in a row "
-            f"({status_text}).{error_text}"
-        )
+@lru_cache(maxsize=128)
+def _failure_fragments(
+    status: Optional[int], error: Optional[str]
+) -> Tuple[str, str]:
+    status_text = f"status={status}" if status is not None else "status=none"
+    error_text = f" error={error}" if error else ""
+    return status_text, error_text
 
-    def build_latency_message(
-        self, url: str, latency_ms: int, threshold_ms: int
-    ) -> str:
-        return (
-            f"Keepalive alert: {url} latency {latency_ms}ms >= {threshold_ms}ms."
-        )
+
+def build_failure_message(url: str, failure_count: int, result: PingResult) -> str:
+    status_text, error_text = _failure_fragments(result.status, result.error)
+    return (
+        f"Keepalive alert: {url} failed {failure_count} times in a row "
+        f"({status_text}).{error_text}"
+    )
+
+
+def build_latency_message(url: str, latency_ms: int, threshold_ms: int) -> str:
+    return f"Keepalive alert: {url} latency {latency_ms}ms >= {threshold_ms}ms."
 
 
 class AlertDispatcher:
@@ -162,13 +216,8 @@ class AlertDispatcher:
         if not self._telegram_manager.send_alert(message):
             print("Telegram alert failed to send.", file=sys.stderr)
 
-
-class IntervalSleeper:
-    def __init__(self, interval_seconds: int):
-        self._interval_seconds = max(1, interval_seconds)
-
-    def sleep(self) -> None:
-        time.sleep(self._interval_seconds)
+    def close(self) -> None:
+        self._telegram_manager.close()
 
 
 class KeepAliveCoordinator:
@@ -177,30 +226,56 @@ class KeepAliveCoordinator:
         url_sequence_builder: UrlSequenceBuilder,
         pinger: PingerManager,
         log_manager: ResultLogManager,
+        classifier: HealthEndpointClassifier,
         outcome_evaluator: PingOutcomeEvaluator,
         failure_tracker: FailureTracker,
         alert_policy: AlertPolicyManager,
         alert_dispatcher: AlertDispatcher,
-        message_builder: AlertMessageBuilder,
-        time_provider: TimeProvider,
-        interval_sleeper: IntervalSleeper,
+        interval_seconds: int,
+        time_now_epoch: Callable[[], float] = now_epoch_seconds,
+        sleep: Callable[[float], None] = time.sleep,
+        monotonic: Callable[[], float] = time.monotonic,
     ):
         self._url_sequence_builder = url_sequence_builder
         self._pinger = pinger
         self._log_manager = log_manager
+        self._classifier = classifier
         self._outcome_evaluator = outcome_evaluator
         self._failure_tracker = failure_tracker
         self._alert_policy = alert_policy
         self._alert_dispatcher = alert_dispatcher
-        self._message_builder = message_builder
-        self._time_provider = time_provider
-        self._interval_sleeper = interval_sleeper
+        self._interval_seconds = max(1, interval_seconds)
+        self._time_now_epoch = time_now_epoch
+        self._sleep = sleep
+        self._monotonic = monotonic
 
     def run_once(self) -> bool:
         cycle_success = True
-        for url in self._url_sequence_builder.build():
-            result = self._pinger.ping_url(url)
-            self._log_manager.log_result(url, result)
+        urls = self._url_sequence_builder.build()
+        # Health endpoints only need a status code, so skip the body.
+        methods = {
+            url: "HEAD" for url in urls if self._classifier.is_health_endpoint(url)
+        }
+        try:
+            # The homepage goes first on its own so the service is awake
+            # before the remaining URLs (deep health, etc.) are fired
+            # concurrently. Each result is logged as its ping completes, so
+            # log lines are in completion order with accurate timestamps.
+            results = []
+            for url in urls[:1]:
+                result = self._pinger.ping_url(url, methods.get(url, "GET"))
+                self._log_manager.log_result(url, result)
+                results.append((url, result))
+            results.extend(
+                self._pinger.ping_urls(
+                    urls[1:], methods, on_result=self._log_manager.log_result
+                )
+            )
+        finally:
+            # Flush before alerting so stderr alert errors follow the result
+            # lines that caused them.
+            self._log_manager.flush()
+        for url, result in results:
             outcome = self._outcome_evaluator.evaluate(url, result)
             if outcome.is_failure:
                 cycle_success = False
@@ -210,9 +285,21 @@ class KeepAliveCoordinator:
         return cycle_success
 
     def run_forever(self) -> None:
+        # Sleep to a fixed deadline so cycle time does not shift the cadence.
+        next_deadline = self._monotonic()
         while True:
             self.run_once()
-            self._interval_sleeper.sleep()
+            next_deadline += self._interval_seconds
+            sleep_for = next_deadline - self._monotonic()
+            if sleep_for > 0:
+                self._sleep(sleep_for)
+            else:
+                # The cycle overran the interval; start again from now.
+                next_deadline = self._monotonic()
+
+    def close(self) -> None:
+        self._pinger.close()
+        self._alert_dispatcher.close()
 
     def _handle_failure_alert(
         self, url: str, result: PingResult, outcome: PingOutcome, failure_count: int
@@ -220,90 +307,78 @@ class KeepAliveCoordinator:
         if not outcome.is_failure:
             return
         if self._alert_policy.should_alert_failure(failure_count):
-            message = self._message_builder.build_failure_message(
-                url, failure_count, result
-            )
+            message = build_failure_message(url, failure_count, result)
             self._alert_dispatcher.dispatch(message)
 
     def _handle_latency_alert(self, url: str, result: PingResult) -> None:
-        now_epoch = self._time_provider.now_epoch_seconds()
+        now_epoch = self._time_now_epoch()
         if not self._alert_policy.should_alert_latency(
             url, result.latency_ms, now_epoch
         ):
             return
-        message = self._message_builder.build_latency_message(
+        message = build_latency_message(
             url, result.latency_ms, self._alert_policy.latency_threshold_ms
         )
         self._alert_dispatcher.dispatch(message)
 
 
-class ConfigPrinter:
-    def print_config(self, config: KeepAliveConfig) -> None:
-        print(json.dumps(config.to_safe_dict(), indent=2))
-
-
-class ArgumentParserBuilder:
-    def build(self) -> argparse.ArgumentParser:
-        parser = argparse.ArgumentParser(description="ParlayGorilla Keep-Alive Pinger")
-        parser.add_argument(
-            "--once",
-            action="store_true",
-            help="Run one ping cycle then exit.",
-        )
-        parser.add_argument(
-            "--print-config",
-            action="store_true",
-            help="Print resolved config and exit.",
-        )
-        return parser
+def print_config(config: KeepAliveConfig) -> None:
+    print(json.dumps(config.to_safe_dict(), indent=2))
 
 
 class CoordinatorFactory:
     def build(self, config: KeepAliveConfig) -> KeepAliveCoordinator:
-        time_provider = TimeProvider()
+        # Interned URLs let every per-URL dict and set lookup below hit the
+        # identity fast path instead of comparing full strings.
+        url_sequence_builder = UrlSequenceBuilder(
+            [sys.intern(url) for url in config.target_urls],
+            [sys.intern(url) for url in config.post_load_urls],
+        )
         retry_policy = RetryPolicy(config.retries, config.backoff_seconds)
         pinger = PingerManager(
             timeout_seconds=config.timeout_seconds,
             retry_policy=retry_policy,
-            user_agent_provider=UserAgentProvider(),
+            max_workers=len(url_sequence_builder.build()),
         )
+        classifier = HealthEndpointClassifier()
+        latency_limiter = LatencyAlertLimiter(cooldown_seconds=3600)
+        latency_limiter.register_urls(url_sequence_builder.build())
         return KeepAliveCoordinator(
-            url_sequence_builder=UrlSequenceBuilder(
-                config.target_urls, config.post_load_urls
-            ),
+            url_sequence_builder=url_sequence_builder,
             pinger=pinger,
-            log_manager=ResultLogManager(time_provider),
-            outcome_evaluator=PingOutcomeEvaluator(HealthEndpointClassifier()),
+            log_manager=ResultLogManager(),
+            classifier=classifier,
+            outcome_evaluator=PingOutcomeEvaluator(classifier),
             failure_tracker=FailureTracker(),
             alert_policy=AlertPolicyManager(
                 config.alert_consecutive_failures,
                 config.alert_latency_ms,
-                LatencyAlertLimiter(cooldown_seconds=3600),
+                latency_limiter,
             ),
             alert_dispatcher=AlertDispatcher(
                 TelegramAlertManager(
                     config.telegram_bot_token, config.telegram_chat_id
                 )
             ),
-            message_builder=AlertMessageBuilder(),
-            time_provider=time_provider,
-            interval_sleeper=IntervalSleeper(config.interval_seconds),
+            interval_seconds=config.interval_seconds,
         )
 
 
 def main() -> int:
-    args = ArgumentParserBuilder().build().parse_args()
-    config = ConfigLoader.from_env()
+    args = _PARSER.parse_args()
+    config = ConfigLoader.from_env(load_dotenv_enabled=not args.no_dotenv)
     if args.print_config:
-        ConfigPrinter().print_config(config)
+        print_config(config)
         return 0
     coordinator = CoordinatorFactory().build(config)
-    if args.once:
-        return 0 if coordinator.run_once() else 1
     try:
+        if args.once:
+            return 0 if coordinator.run_once() else 1
         coordinator.run_forever()
     except KeyboardInterrupt:
         return 0
+    finally:
+        coordinator.close()
     return 0
 
 
@@ -1,13 +1,46 @@
 from __future__ import annotations
 
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from types import MappingProxyType
+from typing import (
+    Callable,
+    Final,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
-@dataclass(frozen=True)
+_USER_AGENT: Final[str] = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+# requests copies headers into each prepared request, so one shared,
+# read-only mapping is safe to hand out on every ping.
+_HEADERS: Final[Mapping[str, str]] = MappingProxyType({"User-Agent": _USER_AGENT})
+
+# Servers that do not route HEAD answer with one of these; retry with GET.
+_METHOD_FALLBACK_STATUSES = (405, 501)
+# Responses that never carry a body, whatever their headers say.
+_NO_BODY_STATUSES = (204, 304)
+# GET bodies at most this large are read and discarded so the socket goes
+# back to the pool; anything larger (or of unknown length) is cheaper to
+# drop and reconnect than to download.
+_DRAIN_LIMIT_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True, slots=True)
 class PingResult:
     ok: bool
     status: Optional[int]
@@ -15,15 +48,6 @@ class PingResult:
     error: Optional[str]
 
 
-class UserAgentProvider:
-    def get_user_agent(self) -> str:
-        return (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        )
-
-
 class RetryPolicy:
     def __init__(self, retries: int, backoff_seconds: int):
         self._max_attempts = max(1, retries + 1)
@@ -37,6 +61,12 @@ class RetryPolicy:
     def backoff_seconds(self) -> int:
         return self._backoff_seconds
 
+    def backoff_for(self, attempt: int) -> float:
+        # Exponential with +/-50% jitter so URLs failing together do not
+        # retry in lockstep against the same upstream.
+        base_seconds = self._backoff_seconds * (2 ** (attempt - 1))
+        return base_seconds * random.uniform(0.5, 1.5)
+
     def should_retry(self, attempt: int, result: PingResult) -> bool:
         if attempt >= self._max_attempts:
             return False
@@ -46,7 +76,7 @@ class RetryPolicy:
 
 
 class BackoffSleeper:
-    def sleep(self, seconds: int) -> None:
+    def sleep(self, seconds: float) -> None:
         time.sleep(seconds)
 
 
@@ -55,37 +85,131 @@ class PingerManager:
         self,
         timeout_seconds: int,
         retry_policy: RetryPolicy,
-        user_agent_provider: UserAgentProvider,
         session: Optional[requests.Session] = None,
         sleeper: Optional[BackoffSleeper] = None,
+        max_workers: int = 4,
     ):
         self._timeout_seconds = max(1, timeout_seconds)
         self._retry_policy = retry_policy
-        self._user_agent_provider = user_agent_provider
-        self._session = session or requests.Session()
+        self._max_workers = max(1, max_workers)
+        self._session = session
+        # Guards lazy session creation and the HEAD-rejection set, both of
+        # which are touched from ping_urls worker threads.
+        self._lock = threading.Lock()
+        self._get_only_urls: Set[str] = set()
         self._sleeper = sleeper or BackoffSleeper()
 
-    def ping_url(self, url: str) -> PingResult:
-        headers = {"User-Agent": self._user_agent_provider.get_user_agent()}
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, pool_block=False
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _get_session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session(self._max_workers)
+        return self._session
+
+    def ping_urls(
+        self,
+        urls: Sequence[str],
+        methods: Optional[Mapping[str, str]] = None,
+        on_result: Optional[Callable[[str, PingResult], None]] = None,
+    ) -> List[Tuple[str, PingResult]]:
+        # Returns one (url, result) pair per input URL, repeats included.
+        # on_result runs on the worker thread as soon as each ping finishes.
+        if not urls:
+            return []
+        methods = methods or {}
+        max_workers = min(len(urls), self._max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self._ping_and_report, url, methods.get(url, "GET"), on_result
+                )
+                for url in urls
+            ]
+            return [(url, future.result()) for url, future in zip(urls, futures)]
+
+    def _ping_and_report(
+        self,
+        url: str,
+        method: str,
+        on_result: Optional[Callable[[str, PingResult], None]],
+    ) -> PingResult:
+        result = self.ping_url(url, method)
+        if on_result is not None:
+            on_result(url, result)
+        return result
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+    def ping_url(self, url: str, method: str = "GET") -> PingResult:
+        headers = _HEADERS
+        if method != "GET" and url in self._get_only_urls:
+            method = "GET"
         for attempt in range(1, self._retry_policy.max_attempts + 1):
-            result = self._attempt_request(url, headers)
+            result = self._attempt_request(url, headers, method)
+            if method != "GET" and result.status in _METHOD_FALLBACK_STATUSES:
+                # Remember the rejection so later cycles go straight to GET.
+                with self._lock:
+                    self._get_only_urls.add(url)
+                method = "GET"
+                result = self._attempt_request(url, headers, method)
             if self._retry_policy.should_retry(attempt, result):
-                self._sleeper.sleep(self._retry_policy.backoff_seconds)
+                self._sleeper.sleep(self._retry_policy.backoff_for(attempt))
                 continue
             return result
         return PingResult(ok=False, status=None, latency_ms=0, error="Unknown error")
 
-    def _attempt_request(self, url: str, headers: dict) -> PingResult:
-        start_time = time.monotonic()
+    @staticmethod
+    def _release(response: requests.Response, method: str) -> None:
+        content_length = response.headers.get("Content-Length")
+        if (
+            method == "HEAD"
+            or response.status_code in _NO_BODY_STATUSES
+            or content_length == "0"
+        ):
+            # Nothing left on the wire; return the socket to the pool as is.
+            # close() here would shut the socket instead.
+            response.raw.release_conn()
+            return
+        if content_length is not None and content_length.isdigit():
+            if int(content_length) <= _DRAIN_LIMIT_BYTES:
+                # Reads the small body and releases the connection.
+                response.raw.drain_conn()
+                return
+        # Unknown or large body: closing an unread response drops the socket.
+        response.close()
+
+    def _attempt_request(
+        self, url: str, headers: Mapping[str, str], method: str
+    ) -> PingResult:
+        start_ns = time.monotonic_ns()
         try:
-            response = self._session.get(
-                url, headers=headers, timeout=self._timeout_seconds
+            # stream=True stops requests from downloading the body; only the
+            # status line is needed. _release decides whether the socket can
+            # go back to the pool.
+            response = self._get_session().request(
+                method,
+                url,
+                headers=headers,
+                timeout=self._timeout_seconds,
+                stream=True,
             )
-            latency_ms = int((time.monotonic() - start_time) * 1000)
+            latency_ms = (time.monotonic_ns() - start_ns) // 1_000_000
             status_code = response.status_code
             ok = response.ok
-            response.close()
+            self._release(response, method)
             return PingResult(ok=ok, status=status_code, latency_ms=latency_ms, error=None)
         except requests.exceptions.RequestException as exc:
-            latency_ms = int((time.monotonic() - start_time) * 1000)
+            latency_ms = (time.monotonic_ns() - start_ns) // 1_000_000
             return PingResult(ok=False, status=None, latency_ms=latency_ms, error=str(exc))
@@ -11,21 +11,35 @@ class TelegramAlertManager:
         bot_token: Optional[str],
         chat_id: Optional[str],
         timeout_seconds: int = 10,
+        session: Optional[requests.Session] = None,
     ):
         self._bot_token = bot_token
         self._chat_id = chat_id
         self._timeout_seconds = timeout_seconds
+        self._session = session
+        self._api_url = (
+            f"https://api.telegram.org/bot{bot_token}/sendMessage"
+            if bot_token and chat_id
+            else None
+        )
 
     def is_configured(self) -> bool:
         return bool(self._bot_token and self._chat_id)
 
     def send_alert(self, message: str) -> bool:
-        if not self.is_configured():
+        if self._api_url is None:
             return False
-        url = f"https://api.telegram.org/bot{self._bot_token}/sendMessage"
+        if self._session is None:
+            self._session = requests.Session()
         payload = {"chat_id": self._chat_id, "text": message}
         try:
-            response = requests.post(url, json=payload, timeout=self._timeout_seconds)
+            response = self._session.post(
+                self._api_url, json=payload, timeout=self._timeout_seconds
+            )
             return response.ok
         except requests.RequestException:
             return False
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
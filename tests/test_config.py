@@ -1,6 +1,8 @@
 import unittest
+from dataclasses import replace
+from unittest.mock import patch
 
-from keepalive.config import ConfigLoader
+from keepalive.config import ConfigLoader, _from_env_cached
 
 
 class ConfigLoaderTests(unittest.TestCase):
@@ -45,5 +47,35 @@ class ConfigLoaderTests(unittest.TestCase):
         )
 
 
+class ConfigLoaderFromEnvTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _from_env_cached.cache_clear()
+        self.addCleanup(_from_env_cached.cache_clear)
+
+    def test_from_env_loads_dotenv_once(self) -> None:
+        with patch("keepalive.config.load_dotenv") as load_dotenv:
+            first = ConfigLoader.from_env()
+            second = ConfigLoader.from_env()
+
+        load_dotenv.assert_called_once_with()
+        self.assertEqual(first, second)
+
+    def test_from_env_returns_independent_lists(self) -> None:
+        with patch("keepalive.config.load_dotenv"):
+            first = ConfigLoader.from_env()
+            first.target_urls.append("https://mutated.example")
+            second = ConfigLoader.from_env()
+
+        self.assertNotIn("https://mutated.example", second.target_urls)
+
+    def test_from_env_uses_subclass(self) -> None:
+        class CustomLoader(ConfigLoader):
+            def load(self):
+                return replace(super().load(), retries=99)
+
+        with patch("keepalive.config.load_dotenv"):
+            self.assertEqual(CustomLoader.from_env().retries, 99)
+            self.assertNotEqual(ConfigLoader.from_env().retries, 99)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,19 +1,55 @@
+import io
+import json
 import unittest
+from contextlib import redirect_stdout
 
 from keepalive.main import (
+    AlertPolicyManager,
     FailureTracker,
     HealthEndpointClassifier,
+    KeepAliveCoordinator,
     LatencyAlertLimiter,
     PingOutcomeEvaluator,
+    ResultLogManager,
     UrlSequenceBuilder,
 )
 from keepalive.pinger import PingResult
 
 
+class FakePinger:
+    def __init__(self, results):
+        self._results = results
+        self.methods = {}
+
+    def ping_url(self, url, method="GET"):
+        self.methods[url] = method
+        return self._results[url]
+
+    def ping_urls(self, urls, methods=None, on_result=None):
+        methods = methods or {}
+        pairs = [(url, self.ping_url(url, methods.get(url, "GET"))) for url in urls]
+        for url, result in pairs:
+            if on_result is not None:
+                on_result(url, result)
+        return pairs
+
+
+class RecordingDispatcher:
+    def __init__(self, stdout=None):
+        self.messages = []
+        self.stdout_at_dispatch = []
+        self._stdout = stdout
+
+    def dispatch(self, message):
+        self.messages.append(message)
+        if self._stdout is not None:
+            self.stdout_at_dispatch.append(self._stdout.getvalue())
+
+
 class MainStateTests(unittest.TestCase):
     def test_url_sequence_builder_orders(self) -> None:
         builder = UrlSequenceBuilder(["home", "health"], ["deep"])
-        self.assertEqual(builder.build(), ["home", "deep", "health"])
+        self.assertEqual(builder.build(), ("home", "deep", "health"))
 
     def test_failure_tracker_counts_and_resets(self) -> None:
         tracker = FailureTracker()
@@ -23,9 +59,11 @@ class MainStateTests(unittest.TestCase):
 
     def test_latency_limiter_cooldown(self) -> None:
         limiter = LatencyAlertLimiter(cooldown_seconds=3600)
+        limiter.register_urls(["url"])
         self.assertTrue(limiter.should_alert("url", 0))
         self.assertFalse(limiter.should_alert("url", 3599))
         self.assertTrue(limiter.should_alert("url", 3600))
+        self.assertTrue(limiter.should_alert("unregistered", 0))
 
     def test_health_404_is_warning(self) -> None:
         evaluator = PingOutcomeEvaluator(HealthEndpointClassifier())
@@ -36,6 +74,119 @@ class MainStateTests(unittest.TestCase):
         self.assertFalse(outcome.is_failure)
         self.assertTrue(outcome.is_warning_only)
 
+    def test_classifier_matches_health_paths(self) -> None:
+        classifier = HealthEndpointClassifier()
+        self.assertTrue(
+            classifier.is_health_endpoint("https://example.com/health?deep=1")
+        )
+        self.assertTrue(classifier.is_health_endpoint("https://example.com/health//"))
+        self.assertTrue(classifier.is_health_endpoint("https://other.com/api/health"))
+        self.assertFalse(classifier.is_health_endpoint("https://example.com/"))
+        self.assertFalse(classifier.is_health_endpoint("https://example.com/healthz"))
+
+    def test_log_manager_buffers_until_flush(self) -> None:
+        log_manager = ResultLogManager(lambda: "2026-01-01T00:00:00.000000+00:00")
+        result = PingResult(ok=True, status=200, latency_ms=5, error=None)
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            log_manager.log_result("a", result)
+            log_manager.log_result("b", result)
+            self.assertEqual(stdout.getvalue(), "")
+            log_manager.flush()
+
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual([json.loads(line)["url"] for line in lines], ["a", "b"])
+
+    def test_coordinator_run_once_with_injected_clock(self) -> None:
+        urls = UrlSequenceBuilder(["home", "https://x/health"], [])
+        pinger = FakePinger(
+            {
+                "home": PingResult(ok=False, status=500, latency_ms=10, error=None),
+                "https://x/health": PingResult(
+                    ok=True, status=200, latency_ms=5000, error=None
+                ),
+            }
+        )
+        classifier = HealthEndpointClassifier()
+        stdout = io.StringIO()
+        dispatcher = RecordingDispatcher(stdout)
+        coordinator = KeepAliveCoordinator(
+            url_sequence_builder=urls,
+            pinger=pinger,
+            log_manager=ResultLogManager(lambda: "ts"),
+            classifier=classifier,
+            outcome_evaluator=PingOutcomeEvaluator(classifier),
+            failure_tracker=FailureTracker(),
+            alert_policy=AlertPolicyManager(1, 4000, LatencyAlertLimiter(3600)),
+            alert_dispatcher=dispatcher,
+            interval_seconds=600,
+            time_now_epoch=lambda: 0.0,
+        )
+
+        with redirect_stdout(stdout):
+            self.assertFalse(coordinator.run_once())
+
+        self.assertEqual(pinger.methods, {"home": "GET", "https://x/health": "HEAD"})
+        self.assertEqual(len(dispatcher.messages), 2)
+        # Every result line is already written when the first alert fires.
+        self.assertEqual(len(dispatcher.stdout_at_dispatch[0].splitlines()), 2)
+
+    def test_coordinator_logs_every_ping_of_repeated_url(self) -> None:
+        urls = UrlSequenceBuilder(["home", "home"], ["home"])
+        ok = PingResult(ok=True, status=200, latency_ms=1, error=None)
+        classifier = HealthEndpointClassifier()
+        coordinator = KeepAliveCoordinator(
+            url_sequence_builder=urls,
+            pinger=FakePinger({"home": ok}),
+            log_manager=ResultLogManager(lambda: "ts"),
+            classifier=classifier,
+            outcome_evaluator=PingOutcomeEvaluator(classifier),
+            failure_tracker=FailureTracker(),
+            alert_policy=AlertPolicyManager(1, 4000, LatencyAlertLimiter(3600)),
+            alert_dispatcher=RecordingDispatcher(),
+            interval_seconds=600,
+        )
+
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            self.assertTrue(coordinator.run_once())
+
+        self.assertEqual(len(stdout.getvalue().splitlines()), 3)
+
+    def test_run_forever_sleeps_to_fixed_deadlines(self) -> None:
+        clock = [0.0]
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) == 2:
+                raise KeyboardInterrupt
+            clock[0] += seconds
+
+        class TimedCoordinator(KeepAliveCoordinator):
+            def run_once(self):
+                clock[0] += 4.0
+                return True
+
+        coordinator = TimedCoordinator(
+            url_sequence_builder=UrlSequenceBuilder([], []),
+            pinger=FakePinger({}),
+            log_manager=ResultLogManager(lambda: "ts"),
+            classifier=HealthEndpointClassifier(),
+            outcome_evaluator=PingOutcomeEvaluator(HealthEndpointClassifier()),
+            failure_tracker=FailureTracker(),
+            alert_policy=AlertPolicyManager(1, 4000, LatencyAlertLimiter(3600)),
+            alert_dispatcher=RecordingDispatcher(),
+            interval_seconds=10,
+            sleep=fake_sleep,
+            monotonic=lambda: clock[0],
+        )
+
+        with self.assertRaises(KeyboardInterrupt):
+            coordinator.run_forever()
+
+        self.assertEqual(sleeps, [6.0, 6.0])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,39 +1,66 @@
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import Mock
 
 import requests
 
-from keepalive.pinger import PingerManager, RetryPolicy, UserAgentProvider
+from keepalive.pinger import PingerManager, RetryPolicy
 
 
 class FakeResponse:
     def __init__(self, status_code: int):
         self.status_code = status_code
         self.ok = 200 <= status_code < 400
+        self.headers = {}
+        self.raw = Mock()
 
     def close(self) -> None:
         return None
 
 
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = b"x" * 1024
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections += 1
+
+    def do_HEAD(self) -> None:
+        self._send_headers()
+
+    def do_GET(self) -> None:
+        self._send_headers()
+        self.wfile.write(self.body)
+
+    def _send_headers(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+
+    def log_message(self, format, *args) -> None:
+        return None
+
+
 class NoOpSleeper:
     def __init__(self):
         self.calls = []
 
-    def sleep(self, seconds: int) -> None:
+    def sleep(self, seconds: float) -> None:
         self.calls.append(seconds)
 
 
 class PingerManagerTests(unittest.TestCase):
     def test_retries_on_5xx_then_succeeds(self) -> None:
         session = Mock()
-        session.get.side_effect = [FakeResponse(500), FakeResponse(200)]
+        session.request.side_effect = [FakeResponse(500), FakeResponse(200)]
 
         retry_policy = RetryPolicy(retries=1, backoff_seconds=1)
         sleeper = NoOpSleeper()
         pinger = PingerManager(
             timeout_seconds=1,
             retry_policy=retry_policy,
-            user_agent_provider=UserAgentProvider(),
             session=session,
             sleeper=sleeper,
         )
@@ -41,18 +68,19 @@ class PingerManagerTests(unittest.TestCase):
         result = pinger.ping_url("https://example.com")
 
         self.assertTrue(result.ok)
-        self.assertEqual(session.get.call_count, 2)
-        self.assertEqual(sleeper.calls, [1])
+        self.assertEqual(session.request.call_count, 2)
+        self.assertTrue(session.request.call_args.kwargs["stream"])
+        self.assertEqual(len(sleeper.calls), 1)
+        self.assertTrue(0.5 <= sleeper.calls[0] <= 1.5)
 
     def test_network_error_returns_failure(self) -> None:
         session = Mock()
-        session.get.side_effect = requests.exceptions.Timeout("boom")
+        session.request.side_effect = requests.exceptions.Timeout("boom")
 
         retry_policy = RetryPolicy(retries=0, backoff_seconds=1)
         pinger = PingerManager(
             timeout_seconds=1,
             retry_policy=retry_policy,
-            user_agent_provider=UserAgentProvider(),
             session=session,
             sleeper=NoOpSleeper(),
         )
@@ -63,6 +91,98 @@ class PingerManagerTests(unittest.TestCase):
         self.assertIsNone(result.status)
         self.assertIsNotNone(result.error)
 
+    def test_head_falls_back_to_get_on_405_and_remembers(self) -> None:
+        session = Mock()
+        session.request.side_effect = [
+            FakeResponse(405),
+            FakeResponse(200),
+            FakeResponse(200),
+        ]
+
+        retry_policy = RetryPolicy(retries=0, backoff_seconds=1)
+        pinger = PingerManager(
+            timeout_seconds=1,
+            retry_policy=retry_policy,
+            session=session,
+            sleeper=NoOpSleeper(),
+        )
+
+        result = pinger.ping_url("https://example.com/health", method="HEAD")
+        second = pinger.ping_url("https://example.com/health", method="HEAD")
+
+        self.assertTrue(result.ok)
+        self.assertTrue(second.ok)
+        methods = [call.args[0] for call in session.request.call_args_list]
+        self.assertEqual(methods, ["HEAD", "GET", "GET"])
+
+    def test_ping_urls_returns_results_in_input_order(self) -> None:
+        statuses = {"https://a.example": 200, "https://b.example": 503}
+        session = Mock()
+        session.request.side_effect = lambda method, url, **kwargs: FakeResponse(
+            statuses[url]
+        )
+
+        retry_policy = RetryPolicy(retries=0, backoff_seconds=1)
+        pinger = PingerManager(
+            timeout_seconds=1,
+            retry_policy=retry_policy,
+            session=session,
+            sleeper=NoOpSleeper(),
+        )
+
+        reported = []
+        results = pinger.ping_urls(
+            ["https://b.example", "https://a.example", "https://b.example"],
+            on_result=lambda url, result: reported.append(url),
+        )
+
+        self.assertEqual(
+            [url for url, _ in results],
+            ["https://b.example", "https://a.example", "https://b.example"],
+        )
+        self.assertEqual([result.ok for _, result in results], [False, True, False])
+        self.assertEqual(sorted(reported), sorted(url for url, _ in results))
+
+
+class PingerConnectionReuseTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        self.server.connections = 0
+        thread = threading.Thread(
+            target=self.server.serve_forever,
+            kwargs={"poll_interval": 0.01},
+            daemon=True,
+        )
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        host, port = self.server.server_address
+        self.url = f"http://{host}:{port}/health"
+        self.pinger = PingerManager(
+            timeout_seconds=5,
+            retry_policy=RetryPolicy(retries=0, backoff_seconds=0),
+            sleeper=NoOpSleeper(),
+        )
+        self.addCleanup(self.pinger.close)
+
+    def test_head_ping_returns_socket_to_pool(self) -> None:
+        for _ in range(3):
+            self.assertTrue(self.pinger.ping_url(self.url, method="HEAD").ok)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_small_get_body_is_drained_and_socket_reused(self) -> None:
+        for _ in range(3):
+            self.assertTrue(self.pinger.ping_url(self.url).ok)
+        self.assertEqual(self.server.connections, 1)
+
+
+class RetryPolicyTests(unittest.TestCase):
+    def test_backoff_grows_exponentially_with_jitter(self) -> None:
+        retry_policy = RetryPolicy(retries=3, backoff_seconds=2)
+        for attempt, base in [(1, 2), (2, 4), (3, 8)]:
+            delay = retry_policy.backoff_for(attempt)
+            self.assertTrue(base * 0.5 <= delay <= base * 1.5)
+
 
 if __name__ == "__main__":
     unittest.main()